@@ -11,7 +11,8 @@ bl_info = {
 import bpy
 import os
 import datetime
-import mathutils
+import time
+import numpy as np
 
 # ------------------------------------------------------------
 # Constants
@@ -20,6 +21,35 @@ import mathutils
 BAKE_SUFFIX = "_bake"
 BAKE_COLLECTION = "VC_Bake"
 DT_MOD_NAME = "DT_VC_Packed"
+JOINED_BAKE_NAME = "_joined_bake"
+BAKE_ID_ATTR = "VB_Bake_ID"
+
+# Data Transfer setup for projecting VC_Packed back onto the originals
+DT_SETTINGS = {
+    # Vertex color transfer
+    "use_vert_data": True,
+    "use_loop_data": False,
+    "data_types_verts": {'VGROUP_WEIGHTS', 'COLOR_VERTEX'},
+    "layers_vcol_vert_select_src": 'ALL',
+    "layers_vcol_vert_select_dst": 'NAME',
+    # Mapping
+    "vert_mapping": 'NEAREST',
+    # Blend
+    "mix_mode": 'REPLACE',
+    "mix_factor": 1.0,
+    # Visibility
+    "show_in_editmode": False,
+}
+
+# Flat vertex color display used to inspect bake results
+VIEWPORT_SHADING = {
+    "type": 'SOLID',
+    "light": 'FLAT',
+    "color_type": 'VERTEX',
+    "show_shadows": False,
+    "show_cavity": False,
+    "show_xray": False,
+}
 
 VC_PACKED = "VC_Packed"
 VC_AO = "VC_AO"
@@ -29,6 +59,78 @@ VC_GRADIENT = "VC_Gradient"
 
 MAT_CURVATURE = "Mat_Curvature"
 MAT_GRADIENT = "Mat_Gradient"
+MAT_CURVATURE_AO = "Mat_Curvature_AO"
+
+BLEND_PATH = os.path.join(os.path.dirname(__file__), "VertexBaker.blend")
+
+# Packing scratch buffers, (role, pow2 size) → float32 array – freed after each bake
+_SCRATCH = {}
+SCRATCH_LIMIT = 8
+
+# Optional numba pack kernel – None until first use, False when numba is missing
+_luminance_kernel = None
+
+# Optional numba AO raycaster – same lazy states as the pack kernel
+_ao_raycaster = None
+
+
+def fibonacci_sphere(count):
+    """
+    count evenly spread unit directions over the whole sphere.
+    """
+    i = np.arange(count) + 0.5
+    z = 1.0 - 2.0 * i / count
+    r = np.sqrt(1.0 - z * z)
+    phi = np.pi * (3.0 - np.sqrt(5.0)) * i
+    return np.column_stack((r * np.cos(phi), r * np.sin(phi), z)).astype(np.float32)
+
+# VC_AO / VC_Curvature / VC_Gradient are grayscale and packed right away – 8 bits hold them
+INTERMEDIATE_COLOR_TYPE = 'BYTE_COLOR'
+
+# Geometry Nodes' implicit color → float conversion (Rec.709 luminance)
+LUMINANCE_WEIGHTS = np.array((0.2126, 0.7152, 0.0722), dtype=np.float32)
+
+# Node types of the stock VC_Packer group
+PACKER_NODE_TYPES = {
+    "NodeGroupInput",
+    "NodeGroupOutput",
+    "GeometryNodeInputNamedAttribute",
+    "FunctionNodeCombineColor",
+    "GeometryNodeStoreNamedAttribute",
+}
+
+# Power-of-two bake tiles per Cycles compute backend.
+# Metal / oneAPI are mostly integrated GPUs – keep their tiles small.
+GPU_TILE_SIZES = {
+    'CUDA': 2048,
+    'OPTIX': 2048,
+    'HIP': 2048,
+    'METAL': 512,
+    'ONEAPI': 512,
+}
+
+# Unit bounding box – origin centered in X/Y, bottom at Z = 0
+BBOX_VERTS = np.array([
+    -0.5, -0.5, 0.0,
+     0.5, -0.5, 0.0,
+     0.5,  0.5, 0.0,
+    -0.5,  0.5, 0.0,
+    -0.5, -0.5, 1.0,
+     0.5, -0.5, 1.0,
+     0.5,  0.5, 1.0,
+    -0.5,  0.5, 1.0,
+], dtype=np.float32)
+
+BBOX_LOOPS = np.array([
+    0, 1, 2, 3,
+    4, 5, 6, 7,
+    0, 1, 5, 4,
+    1, 2, 6, 5,
+    2, 3, 7, 6,
+    3, 0, 4, 7,
+], dtype=np.int32)
+
+BBOX_LOOP_STARTS = np.arange(0, 24, 4, dtype=np.int32)
 
 # ------------------------------------------------------------
 # UI Properties
@@ -38,11 +140,12 @@ class VertexBakerProperties(bpy.types.PropertyGroup):
 
     ao_samples: bpy.props.IntProperty(
         name="AO Samples",
-        description="Number of samples used for AO and diffuse baking",
+        description="Number of AO rays per vertex. Also sets the Cycles samples "
+                    "for the diffuse passes (at most 16 when AO is raycast)",
         default=32,
         min=1,
         soft_max=512,
-        update=lambda self, context: update_vc_processor_sockets(context)
+        update=lambda self, context: schedule_vc_processor_update()
     )# type: ignore
 
 
@@ -51,7 +154,7 @@ class VertexBakerProperties(bpy.types.PropertyGroup):
         default=2,
         min=0,
         soft_max=10,
-        update=lambda self, context: update_vc_processor_sockets(context)
+        update=lambda self, context: schedule_vc_processor_update()
     )  # type: ignore
 
 
@@ -60,7 +163,7 @@ class VertexBakerProperties(bpy.types.PropertyGroup):
         default=1.0,
         min=1.0,
         soft_max=5.0,
-        update=lambda self, context: update_vc_processor_sockets(context)
+        update=lambda self, context: schedule_vc_processor_update()
     )# type: ignore
 
 
@@ -69,7 +172,7 @@ class VertexBakerProperties(bpy.types.PropertyGroup):
         default=2,
         min=0,
         soft_max=10,
-        update=lambda self, context: update_vc_processor_sockets(context)
+        update=lambda self, context: schedule_vc_processor_update()
     )# type: ignore
 
 
@@ -78,7 +181,7 @@ class VertexBakerProperties(bpy.types.PropertyGroup):
         default=1.0,
         min=1.0,
         soft_max=5.0,
-        update=lambda self, context: update_vc_processor_sockets(context)
+        update=lambda self, context: schedule_vc_processor_update()
     )# type: ignore
     
     preview_channel: bpy.props.EnumProperty(
@@ -91,7 +194,7 @@ class VertexBakerProperties(bpy.types.PropertyGroup):
             ('3', "Gradient", "Preview gradient"),
         ],
         default='1',
-        update=lambda self, context: update_vc_processor_sockets(context)
+        update=lambda self, context: schedule_vc_processor_update()
     )  # type: ignore
 
     last_bake_duration: bpy.props.StringProperty(
@@ -123,13 +226,25 @@ def store_selection(context):
     }
 
 
+def _deselect_all(context):
+    # Only touches what is selected – no operator call, no undo push
+    for obj in list(context.selected_objects):
+        obj.select_set(False)
+
+
 def restore_selection(context, state):
-    bpy.ops.object.select_all(action='DESELECT')
+    _deselect_all(context)
+    # Stored references raise ReferenceError once their object is deleted
     for obj in state["selected"]:
-        if obj.name in bpy.data.objects:
+        try:
             obj.select_set(True)
-    if state["active"] and state["active"].name in bpy.data.objects:
-        context.view_layer.objects.active = state["active"]
+        except ReferenceError:
+            continue
+    if state["active"]:
+        try:
+            context.view_layer.objects.active = state["active"]
+        except ReferenceError:
+            pass
 
 
 def prepare_object_mode(context):
@@ -137,10 +252,26 @@ def prepare_object_mode(context):
         bpy.ops.object.mode_set(mode='OBJECT')
 
 
+def disable_global_undo(context):
+    edit = context.preferences.edit
+    state = edit.use_global_undo
+    edit.use_global_undo = False
+    return state
+
+
+def restore_global_undo(context, state):
+    context.preferences.edit.use_global_undo = state
+
+
 def select_objects(context, objects, active=None):
-    bpy.ops.object.select_all(action='DESELECT')
+    # Leave objects that stay selected alone – repeat selections of the bake set touch nothing
+    keep = set(objects)
+    for obj in list(context.selected_objects):
+        if obj not in keep:
+            obj.select_set(False)
     for obj in objects:
-        obj.select_set(True)
+        if not obj.select_get():
+            obj.select_set(True)
     context.view_layer.objects.active = active or (objects[0] if objects else None)
 
 
@@ -159,14 +290,13 @@ def setup_viewport_for_vertex_colors(context):
         space = area.spaces.active
         shading = space.shading
 
-        shading.type = 'SOLID'
-        shading.light = 'FLAT'
-        shading.color_type = 'VERTEX'
-        shading.show_shadows = False
-        shading.show_cavity = False
-        shading.show_xray = False
+        # Equal writes still notify a redraw – skip viewports already set up
+        for key, value in VIEWPORT_SHADING.items():
+            if getattr(shading, key) != value:
+                setattr(shading, key, value)
 
-        space.overlay.show_overlays = False
+        if space.overlay.show_overlays:
+            space.overlay.show_overlays = False
 
 
 # ------------------------------------------------------------
@@ -174,21 +304,18 @@ def setup_viewport_for_vertex_colors(context):
 # ------------------------------------------------------------
 
 def load_from_blend():
-    addon_dir = os.path.dirname(__file__)
-    blend_path = os.path.join(addon_dir, "VertexBaker.blend")
+    # Rebakes are the common loop – don't reopen the library when nothing is missing
+    needed_mats = [m for m in (MAT_CURVATURE, MAT_GRADIENT) if m not in bpy.data.materials]
+    needed_ngs = [n for n in ("VC_Processor", "VC_Packer") if n not in bpy.data.node_groups]
+    if not needed_mats and not needed_ngs:
+        return
 
-    if not os.path.exists(blend_path):
+    if not os.path.exists(BLEND_PATH):
         raise FileNotFoundError("VertexBaker.blend not found next to add-on")
 
-    with bpy.data.libraries.load(blend_path, link=False) as (data_from, data_to):
-
-        for mat in (MAT_CURVATURE, MAT_GRADIENT):
-            if mat not in bpy.data.materials and mat in data_from.materials:
-                data_to.materials.append(mat)
-
-        for ng in ("VC_Processor", "VC_Packer"):
-            if ng not in bpy.data.node_groups and ng in data_from.node_groups:
-                data_to.node_groups.append(ng)
+    with bpy.data.libraries.load(BLEND_PATH, link=False) as (data_from, data_to):
+        data_to.materials = [m for m in needed_mats if m in data_from.materials]
+        data_to.node_groups = [n for n in needed_ngs if n in data_from.node_groups]
 
 
 # ------------------------------------------------------------
@@ -196,9 +323,8 @@ def load_from_blend():
 # ------------------------------------------------------------
 
 def ensure_collection(context, name):
-    if name in bpy.data.collections:
-        coll = bpy.data.collections[name]
-    else:
+    coll = bpy.data.collections.get(name)
+    if not coll:
         coll = bpy.data.collections.new(name)
         context.scene.collection.children.link(coll)
 
@@ -207,19 +333,26 @@ def ensure_collection(context, name):
     return coll
 
 
+def find_layer_collection(layer_coll, target):
+    # The bake collection is linked under the scene root – a keyed lookup finds it
+    child = layer_coll.children.get(target.name)
+    if child and child.collection == target:
+        return child
+
+    # Iterative DFS – deep outliner hierarchies don't pay per-level call overhead
+    stack = [layer_coll]
+    while stack:
+        lc = stack.pop()
+        if lc.collection == target:
+            return lc
+        stack.extend(lc.children)
+    return None
+
+
 def ensure_collection_visible_and_editable(context, collection):
     collection.hide_viewport = False
     collection.hide_render = False
 
-    def find_layer_collection(layer_coll, target):
-        if layer_coll.collection == target:
-            return layer_coll
-        for child in layer_coll.children:
-            found = find_layer_collection(child, target)
-            if found:
-                return found
-        return None
-
     layer_coll = find_layer_collection(
         context.view_layer.layer_collection,
         collection
@@ -230,11 +363,15 @@ def ensure_collection_visible_and_editable(context, collection):
         layer_coll.hide_viewport = False
 
 
-def duplicate_object(obj, suffix, collection):
-    new_name = obj.name + suffix
+def remove_object(name):
+    existing = bpy.data.objects.get(name)
+    if existing:
+        bpy.data.objects.remove(existing, do_unlink=True)
 
-    if new_name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[new_name], do_unlink=True)
+
+def duplicate_object_full(obj, suffix, collection):
+    new_name = obj.name + suffix
+    remove_object(new_name)
 
     dup = obj.copy()
     dup.data = obj.data.copy()
@@ -243,15 +380,59 @@ def duplicate_object(obj, suffix, collection):
     return dup
 
 
+def duplicate_object_linked(obj, suffix, collection):
+    """
+    Duplicate sharing the original's Mesh. Everything baked into it
+    lands directly on the original, no copy or projection needed.
+    """
+    new_name = obj.name + suffix
+    remove_object(new_name)
+
+    dup = obj.copy()
+    dup.name = new_name
+    collection.objects.link(dup)
+    return dup
+
+
+def remove_linked_duplicates(dup_map):
+    """
+    Delete bake objects that still share their original's Mesh, so the
+    user's data is single-user again once the bake is over.
+    """
+    for orig, dup in dup_map.items():
+        try:
+            shared = dup.data == orig.data
+        except ReferenceError:
+            continue
+        if shared:
+            bpy.data.objects.remove(dup, do_unlink=True)
+
+
+def can_link_duplicate(obj):
+    """
+    A shared Mesh is only safe when nothing gets applied to it, the
+    original is its only user and it has material slots to override.
+    """
+    if obj.data.users != 1 or not obj.material_slots:
+        return False
+    return all(is_discarded_bake_modifier(mod) for mod in obj.modifiers)
+
+
 # ------------------------------------------------------------
 # Mesh Preparation (Attributes & Modifiers)
 # ------------------------------------------------------------
 
-def ensure_color_attribute(obj, name):
-    if name not in obj.data.color_attributes:
-        obj.data.color_attributes.new(
+def ensure_color_attribute(obj, name, color_type='FLOAT_COLOR'):
+    color_attributes = obj.data.color_attributes
+    attr = color_attributes.get(name)
+    if attr and attr.data_type != color_type:
+        color_attributes.remove(attr)
+        attr = None
+
+    if not attr:
+        color_attributes.new(
             name=name,
-            type='FLOAT_COLOR',
+            type=color_type,
             domain='POINT'
         )
 
@@ -260,10 +441,16 @@ def set_active_color_attribute(obj, name):
     """
     Set both the active bake target and viewport-displayed color attribute.
     """
-    attr = obj.data.color_attributes.get(name)
-    if attr:
-        obj.data.color_attributes.active_color = attr
-        obj.data.color_attributes.active = attr
+    color_attributes = obj.data.color_attributes
+    attr = color_attributes.get(name)
+    if not attr:
+        return
+
+    # Repeat assignments still tag the mesh for a depsgraph update
+    if color_attributes.active_color != attr:
+        color_attributes.active_color = attr
+    if color_attributes.active != attr:
+        color_attributes.active = attr
 
 
 def remove_unused_target_color_attributes(obj):
@@ -273,7 +460,26 @@ def remove_unused_target_color_attributes(obj):
             obj.data.color_attributes.remove(attr)
 
 
-def clean_bake_object_modifiers(obj, context):
+def is_discarded_bake_modifier(mod):
+    if mod.type == 'DATA_TRANSFER':
+        return True
+    if mod.type == 'NODES' and mod.node_group:
+        return mod.node_group.name in {"VC_Processor", "VC_Packer"}
+    return not mod.show_viewport
+
+
+def assign_bake_material(obj, mat):
+    if obj.data.users > 1:
+        # Shared Mesh – override per object, the original keeps its materials
+        for slot in obj.material_slots:
+            slot.link = 'OBJECT'
+            slot.material = mat
+    else:
+        obj.data.materials.clear()
+        obj.data.materials.append(mat)
+
+
+def clean_bake_object_modifiers(obj, depsgraph):
     """
     Bake meshes must:
     - Have no Data Transfer modifiers
@@ -282,37 +488,59 @@ def clean_bake_object_modifiers(obj, context):
     - Have all remaining modifiers applied
     """
 
-    prepare_object_mode(context)
-    select_objects(context, [obj], obj)
-
-    mods_to_remove = []
-
-    for mod in obj.modifiers:
-        if mod.type == 'DATA_TRANSFER':
-            mods_to_remove.append(mod.name)
-        elif mod.type == 'NODES' and mod.node_group:
-            if mod.node_group.name in {"VC_Processor", "VC_Packer"}:
-                mods_to_remove.append(mod.name)
-        elif not mod.show_viewport:
-            mods_to_remove.append(mod.name)
+    mods_to_remove = [mod.name for mod in obj.modifiers if is_discarded_bake_modifier(mod)]
 
     for mod_name in mods_to_remove:
         mod = obj.modifiers.get(mod_name)
         if mod:
             obj.modifiers.remove(mod)
 
-    for mod in list(obj.modifiers):
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except RuntimeError:
-            pass
+    # Collapse the remaining stack into new mesh data – no operator, no selection
+    if obj.modifiers:
+        depsgraph.update()
+        mesh = bpy.data.meshes.new_from_object(
+            obj.evaluated_get(depsgraph),
+            preserve_all_data_layers=True,
+            depsgraph=depsgraph
+        )
+        old_mesh = obj.data
+        obj.data = mesh
+        obj.modifiers.clear()
+
+        name = old_mesh.name
+        bpy.data.meshes.remove(old_mesh)
+        mesh.name = name
 
 
 # ------------------------------------------------------------
 # Baking Helpers
 # ------------------------------------------------------------
 
-def configure_cycles_for_baking(scene, samples):
+def gpu_tile_size(context):
+    cycles_addon = context.preferences.addons.get("cycles")
+    device_type = cycles_addon.preferences.compute_device_type if cycles_addon else 'NONE'
+    return GPU_TILE_SIZES.get(device_type, 512)
+
+
+def store_tile_settings(scene):
+    return {
+        "use_auto_tile": scene.cycles.use_auto_tile,
+        "tile_size": scene.cycles.tile_size,
+        "threads_mode": scene.render.threads_mode,
+        "threads": scene.render.threads,
+        "debug_use_spatial_splits": scene.cycles.debug_use_spatial_splits,
+    }
+
+
+def restore_tile_settings(scene, state):
+    scene.cycles.use_auto_tile = state["use_auto_tile"]
+    scene.cycles.tile_size = state["tile_size"]
+    scene.render.threads_mode = state["threads_mode"]
+    scene.render.threads = state["threads"]
+    scene.cycles.debug_use_spatial_splits = state["debug_use_spatial_splits"]
+
+
+def configure_cycles_for_baking(scene, samples, tile_size):
     scene.render.engine = 'CYCLES'
     scene.cycles.device = 'GPU'
     scene.cycles.samples = samples
@@ -320,18 +548,112 @@ def configure_cycles_for_baking(scene, samples):
     scene.cycles.light_sampling_threshold = 0.0
     scene.cycles.use_denoising = False
 
+    scene.cycles.use_auto_tile = True
+    scene.cycles.tile_size = tile_size
+
+    # Don't leave CPU-side bake stages under-threaded
+    scene.render.threads_mode = 'FIXED'
+    scene.render.threads = os.cpu_count() or 1
+
+    # Spatial splits only slow down the BVH build each bake call rebuilds
+    scene.cycles.debug_use_spatial_splits = False
+
+    # Both bake passes read the material color only, set once for the whole run
     bake = scene.render.bake
     bake.target = 'VERTEX_COLORS'
     bake.use_selected_to_active = False
     bake.use_multires = False
+    bake.use_pass_direct = False
+    bake.use_pass_indirect = False
+    bake.use_pass_color = True
+
+
+def ensure_curvature_ao_material(scene, curvature_mat):
+    """
+    Derive a material from Mat_Curvature that bakes curvature into R and
+    ambient occlusion into G, so one DIFFUSE color bake covers both.
+    Rebuilt every bake to pick up edits to Mat_Curvature. Returns None when
+    those edits left no Principled BSDF with a linked Base Color driving
+    the output – AO is then baked in a separate pass.
+    """
+    existing = bpy.data.materials.get(MAT_CURVATURE_AO)
+    if existing:
+        bpy.data.materials.remove(existing)
+
+    tree = curvature_mat.node_tree
+    if not tree:
+        return None
+
+    output = next((n for n in tree.nodes if n.type == 'OUTPUT_MATERIAL'), None)
+    surface = output.inputs["Surface"].links if output else ()
+    bsdf = surface[0].from_node if surface else None
+    if not bsdf or bsdf.type != 'BSDF_PRINCIPLED' or not bsdf.inputs["Base Color"].links:
+        return None
+
+    mat = curvature_mat.copy()
+    mat.name = MAT_CURVATURE_AO
+
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
+    output = nodes[output.name]
+    bsdf = nodes[bsdf.name]
+    curvature = bsdf.inputs["Base Color"].links[0].from_socket
+
+    # --- Curvature → R (Principled albedo, same as the plain curvature bake) ---
+    separate = nodes.new("ShaderNodeSeparateColor")
+    curvature_only = nodes.new("ShaderNodeCombineColor")
+    links.new(curvature, separate.inputs["Color"])
+    links.new(separate.outputs["Red"], curvature_only.inputs["Red"])
+    links.new(curvature_only.outputs["Color"], bsdf.inputs["Base Color"])
+
+    # --- AO → G ---
+    # One AO ray per Cycles sample – matches the dedicated AO bake
+    ao = nodes.new("ShaderNodeAmbientOcclusion")
+    ao.samples = 1
+    ao.inputs["Distance"].default_value = ao_distance(scene)
+
+    ao_only = nodes.new("ShaderNodeCombineColor")
+    links.new(ao.outputs["AO"], ao_only.inputs["Green"])
+
+    # Plain diffuse – Principled would scale AO by its specular energy loss
+    diffuse = nodes.new("ShaderNodeBsdfDiffuse")
+    links.new(ao_only.outputs["Color"], diffuse.inputs["Color"])
+
+    add = nodes.new("ShaderNodeAddShader")
+    links.new(bsdf.outputs["BSDF"], add.inputs[0])
+    links.new(diffuse.outputs["BSDF"], add.inputs[1])
+    links.new(add.outputs["Shader"], output.inputs["Surface"])
+
+    return mat
+
+
+def split_curvature_ao(obj):
+    """
+    Unpack the combined bake (R = curvature, G = AO) into the grayscale
+    VC_Curvature and VC_AO attributes the packer reads.
+    """
+    combined = read_color_attribute(obj, VC_CURVATURE).reshape(-1, 4)
+
+    ensure_color_attribute(obj, VC_AO, INTERMEDIATE_COLOR_TYPE)
+
+    for name, channel in ((VC_CURVATURE, 0), (VC_AO, 1)):
+        gray = np.empty_like(combined)
+        gray[:, :3] = combined[:, channel, None]
+        gray[:, 3] = 1.0
+        write_color_attribute(obj, name, gray.ravel())
 
 
 def bake_to_color(context, bake_type, bake_objs, color_name):
+    """
+    Bake every object in one operator call – Cycles syncs the scene and
+    builds its BVH once per call, not once per object.
+    """
     for obj in bake_objs:
         set_active_color_attribute(obj, color_name)
 
     select_objects(context, bake_objs)
-    bpy.ops.object.bake(type=bake_type)
+    bpy.ops.object.bake('EXEC_DEFAULT', type=bake_type)
 
 
 def disable_render_temporarily(objs):
@@ -347,6 +669,469 @@ def restore_render_state(state):
         obj.hide_render = was_hidden
 
 
+# ------------------------------------------------------------
+# Ambient Occlusion Raycaster
+# ------------------------------------------------------------
+
+def ao_distance(scene):
+    world = scene.world
+    return world.light_settings.distance if world else 10.0
+
+
+def _compile_ao_raycaster(njit, prange):
+    @njit(cache=True)
+    def build_bvh(tri_lo, tri_hi, centroids, leaf_size):
+        count = centroids.shape[0]
+        order = np.arange(count).astype(np.int32)
+        capacity = 2 * count - 1
+        node_lo = np.empty((capacity, 3), dtype=np.float32)
+        node_hi = np.empty((capacity, 3), dtype=np.float32)
+        node_left = np.full(capacity, -1, dtype=np.int32)
+        node_start = np.zeros(capacity, dtype=np.int32)
+        node_count = np.zeros(capacity, dtype=np.int32)
+
+        # (node, first, last) ranges still to split – children are left, left + 1
+        stack = np.empty((capacity, 3), dtype=np.int32)
+        stack[0, 0], stack[0, 1], stack[0, 2] = 0, 0, count
+        top = 1
+        used = 1
+
+        while top:
+            top -= 1
+            node, first, last = stack[top, 0], stack[top, 1], stack[top, 2]
+
+            lo = tri_lo[order[first]].copy()
+            hi = tri_hi[order[first]].copy()
+            c_lo = centroids[order[first]].copy()
+            c_hi = centroids[order[first]].copy()
+            for k in range(first + 1, last):
+                t = order[k]
+                for a in range(3):
+                    lo[a] = min(lo[a], tri_lo[t, a])
+                    hi[a] = max(hi[a], tri_hi[t, a])
+                    c_lo[a] = min(c_lo[a], centroids[t, a])
+                    c_hi[a] = max(c_hi[a], centroids[t, a])
+            node_lo[node] = lo
+            node_hi[node] = hi
+
+            if last - first <= leaf_size:
+                node_start[node] = first
+                node_count[node] = last - first
+                continue
+
+            # Median split along the widest centroid extent
+            axis = np.argmax(c_hi - c_lo)
+            keys = np.empty(last - first, dtype=np.float32)
+            for k in range(first, last):
+                keys[k - first] = centroids[order[k], axis]
+            order[first:last] = order[first:last][np.argsort(keys)]
+            middle = (first + last) // 2
+
+            node_left[node] = used
+            stack[top, 0], stack[top, 1], stack[top, 2] = used, first, middle
+            stack[top + 1, 0], stack[top + 1, 1], stack[top + 1, 2] = used + 1, middle, last
+            top += 2
+            used += 2
+
+        return (node_lo[:used], node_hi[:used], node_left[:used],
+                node_start[:used], node_count[:used], order)
+
+    @njit(cache=True)
+    def occluded(ox, oy, oz, dx, dy, dz, wx, wy, wz, slack, max_t, skip,
+                 bvh, v0, e1, e2, tri_ids, stack):
+        node_lo, node_hi, node_left, node_start, node_count, order = bvh
+        ix = 1.0 / dx if dx != 0.0 else 1e30
+        iy = 1.0 / dy if dy != 0.0 else 1e30
+        iz = 1.0 / dz if dz != 0.0 else 1e30
+
+        stack[0] = 0
+        top = 1
+        while top:
+            top -= 1
+            node = stack[top]
+
+            # Slab test against the node bounds
+            t0 = (node_lo[node, 0] - ox) * ix
+            t1 = (node_hi[node, 0] - ox) * ix
+            near, far = min(t0, t1), max(t0, t1)
+            t0 = (node_lo[node, 1] - oy) * iy
+            t1 = (node_hi[node, 1] - oy) * iy
+            near, far = max(near, min(t0, t1)), min(far, max(t0, t1))
+            t0 = (node_lo[node, 2] - oz) * iz
+            t1 = (node_hi[node, 2] - oz) * iz
+            near, far = max(near, min(t0, t1)), min(far, max(t0, t1))
+            if far < max(near, -slack) or near > max_t:
+                continue
+
+            if node_left[node] >= 0:
+                stack[top] = node_left[node]
+                stack[top + 1] = node_left[node] + 1
+                top += 2
+                continue
+
+            # Any hit within range occludes – Möller–Trumbore per triangle
+            for k in range(node_start[node], node_start[node] + node_count[node]):
+                t = order[k]
+                # Triangles around the shaded vertex can only be hit at its origin
+                if tri_ids[t, 0] == skip or tri_ids[t, 1] == skip or tri_ids[t, 2] == skip:
+                    continue
+                px = dy * e2[t, 2] - dz * e2[t, 1]
+                py = dz * e2[t, 0] - dx * e2[t, 2]
+                pz = dx * e2[t, 1] - dy * e2[t, 0]
+                det = e1[t, 0] * px + e1[t, 1] * py + e1[t, 2] * pz
+                if abs(det) < 1e-12:
+                    continue
+                inv_det = 1.0 / det
+                sx = ox - v0[t, 0]
+                sy = oy - v0[t, 1]
+                sz = oz - v0[t, 2]
+                u = (sx * px + sy * py + sz * pz) * inv_det
+                if u < 0.0 or u > 1.0:
+                    continue
+                qx = sy * e1[t, 2] - sz * e1[t, 1]
+                qy = sz * e1[t, 0] - sx * e1[t, 2]
+                qz = sx * e1[t, 1] - sy * e1[t, 0]
+                v = (dx * qx + dy * qy + dz * qz) * inv_det
+                if v < 0.0 or u + v > 1.0:
+                    continue
+                hit = (e2[t, 0] * qx + e2[t, 1] * qy + e2[t, 2] * qz) * inv_det
+                if hit <= -slack or hit >= max_t:
+                    continue
+                if hit < slack:
+                    # Geometry touching the shaded point only blocks rays crossing
+                    # it on the side the surface faces (the vertex normal w)
+                    cx = e1[t, 1] * e2[t, 2] - e1[t, 2] * e2[t, 1]
+                    cy = e1[t, 2] * e2[t, 0] - e1[t, 0] * e2[t, 2]
+                    cz = e1[t, 0] * e2[t, 1] - e1[t, 1] * e2[t, 0]
+                    if det * (wx * cx + wy * cy + wz * cz) >= 0.0:
+                        continue
+                return True
+        return False
+
+    @njit(parallel=True, cache=True)
+    def occlusion(points, normals, sides, ids, directions, slack, max_t,
+                  bvh, v0, e1, e2, tri_ids, out):
+        for i in prange(points.shape[0]):
+            stack = np.empty(64, dtype=np.int32)
+            nx, ny, nz = normals[i, 0], normals[i, 1], normals[i, 2]
+            ox, oy, oz = points[i, 0], points[i, 1], points[i, 2]
+            wx, wy, wz = sides[i, 0], sides[i, 1], sides[i, 2]
+
+            # Cosine-weighted visibility over the directions above the surface
+            visible = 0.0
+            total = 0.0
+            for s in range(directions.shape[0]):
+                dx, dy, dz = directions[s, 0], directions[s, 1], directions[s, 2]
+                c = nx * dx + ny * dy + nz * dz
+                if c <= 0.0:
+                    continue
+                total += c
+                if not occluded(ox, oy, oz, dx, dy, dz, wx, wy, wz, slack, max_t, ids[i],
+                                bvh, v0, e1, e2, tri_ids, stack):
+                    visible += c
+            out[i] = visible / total if total > 0.0 else 1.0
+
+    return build_bvh, occlusion
+
+
+def ao_raycaster():
+    """
+    Numba BVH builder and occlusion kernel, or None when numba isn't installed
+    and AO has to come from the Cycles bake.
+    """
+    global _ao_raycaster
+
+    if _ao_raycaster is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _ao_raycaster = False
+        else:
+            _ao_raycaster = _compile_ao_raycaster(njit, prange)
+
+    return _ao_raycaster or None
+
+
+def gather_occluders(depsgraph, exclude):
+    """
+    World-space triangles of every render-visible mesh in the evaluated
+    scene – the geometry Cycles' AO sees – minus the objects in exclude.
+    Also returns scene-wide vertex ids per triangle corner and the first id
+    of each non-instanced object, so shaded vertices can skip their own faces.
+    """
+    tris = []
+    tri_ids = []
+    first_ids = {}
+    vertex_count = 0
+    for instance in depsgraph.object_instances:
+        obj = instance.object
+        if obj.type != 'MESH' or not instance.show_self:
+            continue
+        if obj.original.hide_render or obj.original in exclude:
+            continue
+
+        mesh = obj.data
+        matrix = np.array(instance.matrix_world, dtype=np.float32)
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+        tri_verts = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tri_verts)
+        tri_verts = tri_verts.reshape(-1, 3)
+        tris.append(co[tri_verts])
+        tri_ids.append(tri_verts + vertex_count)
+
+        if not instance.is_instance:
+            first_ids[obj.original] = vertex_count
+        vertex_count += len(co)
+
+    if not tris:
+        return np.empty((0, 3, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32), first_ids
+    return (
+        np.ascontiguousarray(np.concatenate(tris), dtype=np.float32),
+        np.ascontiguousarray(np.concatenate(tri_ids), dtype=np.int32),
+        first_ids
+    )
+
+
+def bake_ambient_occlusion(context, objs, exclude, samples):
+    """
+    Raycast ambient occlusion into VC_AO without a Cycles bake. Occluders are
+    all render-visible meshes except exclude (the originals, which Cycles
+    bakes with hidden); like Cycles' vertex color bake, AO is shaded per
+    corner normal and averaged per vertex. Every point traces the same
+    directions, so the result is noise-free and rays stay coherent.
+    """
+    build_bvh, occlusion = ao_raycaster()
+    depsgraph = context.evaluated_depsgraph_get()
+    # Spread over the whole sphere – about samples of them lie above a surface
+    directions = fibonacci_sphere(2 * samples)
+    max_t = ao_distance(context.scene)
+
+    tris, tri_ids, first_ids = gather_occluders(depsgraph, set(exclude))
+    if len(tris):
+        bvh = build_bvh(
+            np.ascontiguousarray(tris.min(axis=1)),
+            np.ascontiguousarray(tris.max(axis=1)),
+            np.ascontiguousarray(tris.mean(axis=1)),
+            4
+        )
+        v0 = np.ascontiguousarray(tris[:, 0])
+        e1 = np.ascontiguousarray(tris[:, 1] - v0)
+        e2 = np.ascontiguousarray(tris[:, 2] - v0)
+
+    for obj in objs:
+        # Shape keys move the surface the occluders are built from – shade that one
+        mesh = obj.evaluated_get(depsgraph).data
+        matrix = np.array(obj.matrix_world, dtype=np.float32)
+        normal_matrix = np.linalg.inv(matrix[:3, :3]).T
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+        corner_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", corner_verts)
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+        normals = normals.reshape(-1, 3) @ normal_matrix.T
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+
+        # Smooth vertices share one normal across their corners – shade those once
+        keys, inverse = np.unique(
+            np.column_stack((corner_verts, np.round(normals, 4))),
+            axis=0,
+            return_inverse=True
+        )
+        vertices = keys[:, 0].astype(np.int32)
+        shaded = np.ones(len(keys), dtype=np.float32)
+
+        if len(tris) and len(keys):
+            point_normals = np.ascontiguousarray(keys[:, 1:], dtype=np.float32)
+            point_normals /= np.maximum(np.linalg.norm(point_normals, axis=1, keepdims=True), 1e-12)
+            sides = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertex_normals.foreach_get("vector", sides)
+            sides = sides.reshape(-1, 3)[vertices] @ normal_matrix.T
+
+            # Rays start on the surface – a push along the normal would tunnel
+            # through geometry it rests on. Own faces are skipped by vertex id,
+            # the slack (sized to this object) only absorbs rounding.
+            first = first_ids.get(obj)
+            ids = vertices + first if first is not None else np.full(len(keys), -1, dtype=np.int32)
+            slack = max(float(np.linalg.norm(np.ptp(co, axis=0))), 1e-3) * 1e-5
+            occlusion(
+                np.ascontiguousarray(co[vertices]),
+                point_normals,
+                np.ascontiguousarray(sides, dtype=np.float32),
+                np.ascontiguousarray(ids, dtype=np.int32),
+                directions,
+                slack,
+                max_t,
+                bvh,
+                v0,
+                e1,
+                e2,
+                tri_ids,
+                shaded
+            )
+
+        vertex_count = len(co)
+        corner_count = np.bincount(corner_verts, minlength=vertex_count)
+        vertex_ao = np.bincount(corner_verts, weights=shaded[inverse.ravel()], minlength=vertex_count)
+        vertex_ao = np.divide(
+            vertex_ao,
+            corner_count,
+            out=np.ones(vertex_count),
+            where=corner_count > 0
+        )
+
+        gray = np.empty((vertex_count, 4), dtype=np.float32)
+        gray[:, :3] = vertex_ao[:, None]
+        gray[:, 3] = 1.0
+        ensure_color_attribute(obj, VC_AO, INTERMEDIATE_COLOR_TYPE)
+        write_color_attribute(obj, VC_AO, gray.ravel())
+
+
+# ------------------------------------------------------------
+# Packing Helpers
+# ------------------------------------------------------------
+
+def _packer_link(socket, bl_idname):
+    """
+    The only link into socket if it comes from a bl_idname node, else None.
+    """
+    links = socket.links
+    if len(links) != 1 or links[0].from_node.bl_idname != bl_idname:
+        return None
+    return links[0]
+
+
+def packer_channels(packer):
+    """
+    Return the (R, G, B) attribute names of an unmodified VC_Packer group,
+    or None when the group was edited and has to be evaluated as nodes.
+    The graph is walked link by link, so rewired sockets and changed node
+    settings count as edits too.
+    """
+    nodes = packer.nodes
+    if {n.bl_idname for n in nodes} != PACKER_NODE_TYPES:
+        return None
+    if len(nodes) != 7 or len(packer.links) != 9:
+        return None
+    if any(n.mute for n in nodes) or any(l.is_muted or not l.is_valid for l in packer.links):
+        return None
+
+    output = next(n for n in nodes if n.bl_idname == "NodeGroupOutput")
+    link = _packer_link(output.inputs[0], "GeometryNodeStoreNamedAttribute")
+    if not link:
+        return None
+
+    store = link.from_node
+    if (store.data_type != 'FLOAT_COLOR'
+            or store.domain != 'POINT'
+            or store.inputs["Name"].default_value != VC_PACKED
+            or not store.inputs["Selection"].default_value):
+        return None
+
+    link = _packer_link(store.inputs["Geometry"], "NodeGroupInput")
+    if not link or link.from_socket.type != 'GEOMETRY':
+        return None
+
+    link = _packer_link(store.inputs["Value"], "FunctionNodeCombineColor")
+    if not link:
+        return None
+
+    combine = link.from_node
+    if combine.mode != 'RGB' or combine.inputs["Alpha"].default_value != 1.0:
+        return None
+
+    names = {
+        item.identifier: item.default_value
+        for item in packer.interface.items_tree
+        if item.item_type == 'SOCKET'
+        and item.in_out == 'INPUT'
+        and item.socket_type == 'NodeSocketString'
+    }
+
+    # Each channel is read by its own Named Attribute, named by a group input
+    channels = []
+    readers = set()
+    for channel in ("Red", "Green", "Blue"):
+        link = _packer_link(combine.inputs[channel], "GeometryNodeInputNamedAttribute")
+        if not link or link.from_node.name in readers:
+            return None
+
+        reader = link.from_node
+        readers.add(reader.name)
+        if reader.data_type != 'FLOAT_COLOR':
+            return None
+
+        link = _packer_link(reader.inputs["Name"], "NodeGroupInput")
+        if not link or link.from_socket.identifier not in names:
+            return None
+        channels.append(names[link.from_socket.identifier])
+
+    return tuple(channels)
+
+
+def luminance_kernel():
+    """
+    Numba-compiled luminance kernel, or None when numba isn't installed.
+    Compiled on first use so add-on startup doesn't pay for it.
+    """
+    global _luminance_kernel
+
+    if _luminance_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _luminance_kernel = False
+        else:
+            @njit(parallel=True, fastmath=True, cache=True)
+            def kernel(rgba, out, column, weights):
+                for i in prange(rgba.shape[0]):
+                    out[i, column] = (
+                        rgba[i, 0] * weights[0]
+                        + rgba[i, 1] * weights[1]
+                        + rgba[i, 2] * weights[2]
+                    )
+
+            _luminance_kernel = kernel
+
+    return _luminance_kernel or None
+
+
+def pack_colors(obj, channels, color_type='FLOAT_COLOR'):
+    """
+    numpy equivalent of the stock VC_Packer group: the luminance of each
+    channel attribute goes into R, G and B of VC_Packed, alpha is 1.
+    """
+    size = len(obj.data.vertices) * 4
+    rgba = scratch_buffer("channel", size)
+    packed = scratch_buffer("packed", size)
+    packed_rgba = packed.reshape(-1, 4)
+    kernel = luminance_kernel()
+
+    for column, name in enumerate(channels):
+        if not name:
+            # A cleared packer input – Named Attribute reads zeros for it
+            packed_rgba[:, column] = 0.0
+            continue
+
+        read_color_attribute(obj, name, rgba)
+        if kernel:
+            # One fused pass instead of a slice, a matmul and a strided store
+            kernel(rgba.reshape(-1, 4), packed_rgba, column, LUMINANCE_WEIGHTS)
+        else:
+            packed_rgba[:, column] = rgba.reshape(-1, 4)[:, :3] @ LUMINANCE_WEIGHTS
+    packed_rgba[:, 3] = 1.0
+
+    ensure_color_attribute(obj, VC_PACKED, color_type)
+    write_color_attribute(obj, VC_PACKED, packed)
+
+
 # ------------------------------------------------------------
 # Projection Helpers
 # ------------------------------------------------------------
@@ -358,23 +1143,156 @@ def ensure_datatransfer(obj, src):
 
     mod.object = src
 
-    # --- Vertex color transfer ---
-    mod.use_vert_data = True
-    mod.use_loop_data = False
+    # Re-bakes find the modifier already configured – only write what differs
+    for key, value in DT_SETTINGS.items():
+        if getattr(mod, key) != value:
+            setattr(mod, key, value)
 
-    mod.data_types_verts = {'VGROUP_WEIGHTS', 'COLOR_VERTEX'}
-    mod.layers_vcol_vert_select_src = 'ALL'
-    mod.layers_vcol_vert_select_dst = 'NAME'
 
-    # Mapping
-    mod.vert_mapping = 'NEAREST'
+def has_matching_topology(orig, dup):
+    """
+    True when the bake mesh still has the original's vertices in the same
+    order, i.e. applied modifiers at most moved them (deform-only stacks).
+    Vertex i then carries the color Data Transfer would have mapped to it.
+    """
+    a = orig.data
+    b = dup.data
 
-    # Blend
-    mod.mix_mode = 'REPLACE'
-    mod.mix_factor = 1.0
+    if (len(a.vertices) != len(b.vertices)
+            or len(a.polygons) != len(b.polygons)
+            or len(a.loops) != len(b.loops)):
+        return False
 
-    # Visibility
-    mod.show_in_editmode = False
+    corners_a = np.empty(len(a.loops), dtype=np.int32)
+    corners_b = np.empty_like(corners_a)
+    a.loops.foreach_get("vertex_index", corners_a)
+    b.loops.foreach_get("vertex_index", corners_b)
+    return np.array_equal(corners_a, corners_b)
+
+
+def copy_packed_colors(orig, dup):
+    """
+    Copy VC_Packed straight from the bake mesh when both share topology.
+    No Data Transfer modifier is left on the original, so nothing has to
+    be re-evaluated per depsgraph update.
+    Returns False when Data Transfer is needed: the topology differs, or
+    the Mesh is shared by instances that each bake to different colors.
+    """
+    # A linked duplicate already packed into the shared Mesh
+    if orig.data != dup.data:
+        if orig.data.users != 1 or not has_matching_topology(orig, dup):
+            return False
+
+        # Final projected result – 8 bits per channel is plenty
+        ensure_color_attribute(orig, VC_PACKED, 'BYTE_COLOR')
+        colors = scratch_buffer("copy", len(dup.data.vertices) * 4)
+        write_color_attribute(orig, VC_PACKED, read_color_attribute(dup, VC_PACKED, colors))
+
+    # Drop a Data Transfer left over from an earlier bake
+    mod = orig.modifiers.get(DT_MOD_NAME)
+    if mod:
+        orig.modifiers.remove(mod)
+
+    return True
+
+
+# ------------------------------------------------------------
+# Color Buffer Helpers
+# ------------------------------------------------------------
+
+def scratch_buffer(role, size):
+    """
+    Reusable float32 buffer of exactly `size` elements, backed by a
+    power-of-two allocation so similarly sized meshes share it.
+    """
+    bucket = 1 << max(size - 1, 0).bit_length()
+    key = (role, bucket)
+
+    # pop + reinsert keeps the dict in least-recently-used order
+    buf = _SCRATCH.pop(key, None)
+    if buf is None:
+        buf = np.empty(bucket, dtype=np.float32)
+    _SCRATCH[key] = buf
+
+    while len(_SCRATCH) > SCRATCH_LIMIT:
+        del _SCRATCH[next(iter(_SCRATCH))]
+
+    return buf[:size]
+
+
+def read_color_attribute(obj, name, out=None):
+    data = obj.data.color_attributes[name].data
+    buf = out if out is not None else np.empty(len(data) * 4, dtype=np.float32)
+    data.foreach_get("color", buf)
+    return buf
+
+
+def write_color_attribute(obj, name, buf):
+    obj.data.color_attributes[name].data.foreach_set("color", buf)
+    obj.data.update()
+
+
+# ------------------------------------------------------------
+# Join-for-Bake Helpers
+# ------------------------------------------------------------
+
+def join_bake_objects(context, bake_objs, collection):
+    """
+    Join copies of all bake objects into one mesh so Cycles syncs a single
+    object per bake. Every vertex is tagged with the index of its source.
+    """
+    remove_object(JOINED_BAKE_NAME)
+
+    copies = []
+    for index, obj in enumerate(bake_objs):
+        copy = obj.copy()
+        copy.data = obj.data.copy()
+        collection.objects.link(copy)
+
+        ids = np.full(len(copy.data.vertices), index, dtype=np.int32)
+        attr = copy.data.attributes.new(BAKE_ID_ATTR, 'INT', 'POINT')
+        attr.data.foreach_set("value", ids)
+        copies.append(copy)
+
+    joined = copies[0]
+    meshes = [c.data for c in copies[1:]]
+
+    select_objects(context, copies, joined)
+    bpy.ops.object.join()
+    joined.name = JOINED_BAKE_NAME
+
+    # Join leaves the consumed meshes behind as orphans
+    for mesh in meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+    return joined
+
+
+def split_joined_bake(joined, bake_objs, names):
+    """
+    Scatter the baked color attributes of the joined mesh back onto
+    the individual bake objects, keyed on the per-vertex source index.
+    """
+    ids = np.empty(len(joined.data.vertices), dtype=np.int32)
+    joined.data.attributes[BAKE_ID_ATTR].data.foreach_get("value", ids)
+    masks = [ids == index for index in range(len(bake_objs))]
+
+    for obj in bake_objs:
+        for name in names:
+            ensure_color_attribute(obj, name, INTERMEDIATE_COLOR_TYPE)
+
+    for name in names:
+        colors = read_color_attribute(joined, name).reshape(-1, 4)
+        for obj, mask in zip(bake_objs, masks):
+            write_color_attribute(obj, name, colors[mask].ravel())
+
+
+def remove_joined_bake(joined):
+    mesh = joined.data
+    bpy.data.objects.remove(joined, do_unlink=True)
+    if mesh.users == 0:
+        bpy.data.meshes.remove(mesh)
 
 
 # ------------------------------------------------------------
@@ -393,18 +1311,13 @@ def create_combined_bounding_box(context, objects, collection):
     # --------------------------------------------------------
     # Compute combined world-space bounds
     # --------------------------------------------------------
-    min_x = min_y = min_z = float("inf")
-    max_x = max_y = max_z = float("-inf")
+    # One batched transform of every (N, 8) local corner instead of per-corner Vectors
+    corners = np.array([obj.bound_box for obj in objects], dtype=np.float64)
+    matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float64)
+    world = corners @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
 
-    for obj in objects:
-        for corner in obj.bound_box:
-            world_corner = obj.matrix_world @ mathutils.Vector(corner)
-            min_x = min(min_x, world_corner.x)
-            min_y = min(min_y, world_corner.y)
-            min_z = min(min_z, world_corner.z)
-            max_x = max(max_x, world_corner.x)
-            max_y = max(max_y, world_corner.y)
-            max_z = max(max_z, world_corner.z)
+    min_x, min_y, min_z = world.reshape(-1, 3).min(axis=0)
+    max_x, max_y, max_z = world.reshape(-1, 3).max(axis=0)
 
     size_x = max_x - min_x
     size_y = max_y - min_y
@@ -418,8 +1331,7 @@ def create_combined_bounding_box(context, objects, collection):
     # Remove existing bounding box if present
     # --------------------------------------------------------
     name = "_boundingbox_bake"
-    if name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[name], do_unlink=True)
+    remove_object(name)
 
     # --------------------------------------------------------
     # Create mesh
@@ -429,36 +1341,14 @@ def create_combined_bounding_box(context, objects, collection):
 
     collection.objects.link(bbox)
 
-    # Create cube geometry
-    bm = bpy.data.meshes.new_from_object(
-        bpy.data.objects.new("temp", bpy.data.meshes.new("temp_mesh")),
-        preserve_all_data_layers=False,
-        depsgraph=context.evaluated_depsgraph_get()
-    )
-
-    # Manually define cube
-    verts = [
-        (-0.5, -0.5, 0.0),
-        ( 0.5, -0.5, 0.0),
-        ( 0.5,  0.5, 0.0),
-        (-0.5,  0.5, 0.0),
-        (-0.5, -0.5, 1.0),
-        ( 0.5, -0.5, 1.0),
-        ( 0.5,  0.5, 1.0),
-        (-0.5,  0.5, 1.0),
-    ]
-
-    faces = [
-        (0, 1, 2, 3),
-        (4, 5, 6, 7),
-        (0, 1, 5, 4),
-        (1, 2, 6, 5),
-        (2, 3, 7, 6),
-        (3, 0, 4, 7),
-    ]
-
-    mesh.from_pydata(verts, [], faces)
-    mesh.update()
+    # Fill the cube from flat buffers – face sizes follow from the loop starts
+    mesh.vertices.add(8)
+    mesh.vertices.foreach_set("co", BBOX_VERTS)
+    mesh.loops.add(24)
+    mesh.loops.foreach_set("vertex_index", BBOX_LOOPS)
+    mesh.polygons.add(6)
+    mesh.polygons.foreach_set("loop_start", BBOX_LOOP_STARTS)
+    mesh.update(calc_edges=True)
 
     # --------------------------------------------------------
     # Transform to match bounds
@@ -479,6 +1369,18 @@ def update_vc_processor_sockets(context):
     """
     props = context.scene.vertex_baker
 
+    # Read the properties once, not once per object
+    sockets = (
+        # Preview Channel (enum → int)
+        ("Socket_2", int(props.preview_channel) - 1),
+        # AO
+        ("Socket_7", props.ao_blur),
+        ("Socket_6", props.ao_contrast),
+        # Curvature
+        ("Socket_3", props.curvature_blur),
+        ("Socket_4", props.curvature_contrast),
+    )
+
     for obj in context.selected_objects:
         if obj.type != 'MESH':
             continue
@@ -487,21 +1389,27 @@ def update_vc_processor_sockets(context):
         if not mod:
             continue
 
-        # Preview Channel (enum → int)
-        mod["Socket_2"] = int(props.preview_channel)-1
-
-        # AO
-        mod["Socket_7"] = props.ao_blur
-        mod["Socket_6"] = props.ao_contrast
-
-        # Curvature
-        mod["Socket_3"] = props.curvature_blur
-        mod["Socket_4"] = props.curvature_contrast
+        for socket, value in sockets:
+            mod[socket] = value
 
         #Force update geometry nodes
         obj.update_tag()
 
 
+def _flush_vc_processor_update():
+    update_vc_processor_sockets(bpy.context)
+    return None
+
+
+def schedule_vc_processor_update():
+    """
+    Slider drags fire an update per step – collapse them into one socket
+    push that reads the latest values shortly after.
+    """
+    if not bpy.app.timers.is_registered(_flush_vc_processor_update):
+        bpy.app.timers.register(_flush_vc_processor_update, first_interval=0.05)
+
+
 # ------------------------------------------------------------
 # Main Operator
 # ------------------------------------------------------------
@@ -511,6 +1419,19 @@ class OBJECT_OT_vc_bake_project(bpy.types.Operator):
     bl_label = "VCBake Project"
     bl_options = {'REGISTER', 'UNDO'}
 
+    batch_mode: bpy.props.BoolProperty(
+        name="Join For Bake",
+        description="Join all bake meshes into one temporary object so each pass runs a single Cycles bake",
+        default=False
+    )  # type: ignore
+
+    skip_unused_passes: bpy.props.BoolProperty(
+        name="Skip Unused Passes",
+        description="Don't bake the gradient when VC_Packer doesn't read it, "
+                    "e.g. after clearing its Blue input",
+        default=True
+    )  # type: ignore
+
     def execute(self, context):
         start_time = datetime.datetime.now()
         selection_state = store_selection(context)
@@ -523,118 +1444,218 @@ class OBJECT_OT_vc_bake_project(bpy.types.Operator):
 
         log(f"Bake started at: {timestamp_now()}")
 
+        # Intermediate states aren't worth undo steps – the operator pushes one at the end
+        undo_state = disable_global_undo(context)
+
         try:
+            # Only the first bake in a file reads the library – later ones find the assets
             load_from_blend()
+
+            # With numba, AO is raycast and the Cycles bake only covers curvature
+            raycast_ao = ao_raycaster() is not None
             curvature_mat = bpy.data.materials[MAT_CURVATURE]
+            combined_ao = False
+            if not raycast_ao:
+                combined_mat = ensure_curvature_ao_material(context.scene, curvature_mat)
+                if combined_mat:
+                    curvature_mat, combined_ao = combined_mat, True
             gradient_mat = bpy.data.materials[MAT_GRADIENT]
+            packer = bpy.data.node_groups["VC_Packer"]
+            processor = bpy.data.node_groups["VC_Processor"]
+            channels = packer_channels(packer)
+
+            # An edited packer is a node graph – only the stock one tells what it reads
+            needs_gradient = not (
+                self.skip_unused_passes and channels and VC_GRADIENT not in channels
+            )
+            baked = (VC_AO, VC_CURVATURE) + ((VC_GRADIENT,) if needs_gradient else ())
+
+            # numpy packing only reads the passes baked here or cleared inputs –
+            # other names go through the nodes
+            if channels and not set(channels) <= set(baked + ("",)):
+                channels = None
 
             bake_coll = ensure_collection(context, BAKE_COLLECTION)
             ensure_collection_visible_and_editable(context, bake_coll)
 
             original_engine = context.scene.render.engine
+            original_tiles = store_tile_settings(context.scene)
+            active_colors = []
+            dup_map = {}
+            joined = None
+            dup_render_state = {}
 
-            try:
-                dup_map = {}
-                for obj in originals:
-                    ensure_color_attribute(obj, VC_PACKED)
-                    ensure_color_attribute(obj, VC_PREVIEW)
-                    dup_map[obj] = duplicate_object(obj, BAKE_SUFFIX, bake_coll)
-
-                bake_objs = list(dup_map.values())
-
+            # One update per finished bake pass – bakes block, finer steps only cost redraws
+            wm = context.window_manager
+            wm.progress_begin(0, 2)
 
+            try:
                 # --------------------------------------------------------
-                # Curvature Bake
+                # Bake Mesh Setup
                 # --------------------------------------------------------
 
-                for obj in bake_objs:
-                    obj.hide_set(False)
-                    obj.hide_viewport = False
-                    obj.data.materials.clear()
-                    obj.data.materials.append(curvature_mat)
-
-                    for attr in (VC_PACKED, VC_AO, VC_CURVATURE, VC_GRADIENT, VC_PREVIEW):
-                        ensure_color_attribute(obj, attr)
+                # Each duplicate is set up as it's made – one pass over the bake set
+                phase_start = time.perf_counter()
+                prepare_object_mode(context)
+                depsgraph = context.evaluated_depsgraph_get()
 
-                    clean_bake_object_modifiers(obj, context)
-
-                props = context.scene.vertex_baker
-                configure_cycles_for_baking(context.scene, props.ao_samples)
-                bake = context.scene.render.bake
+                for obj in originals:
+                    ensure_color_attribute(obj, VC_PREVIEW)
+                    remove_object(obj.name + BAKE_SUFFIX)
 
-                bake.use_pass_direct = False
-                bake.use_pass_indirect = False
-                bake.use_pass_color = True
-                bake_to_color(context, 'DIFFUSE', bake_objs, VC_CURVATURE)
+                    # Applying the VC_Packer modifier needs single-user data
+                    if channels and not self.batch_mode and can_link_duplicate(obj):
+                        dup = duplicate_object_linked(obj, BAKE_SUFFIX, bake_coll)
+                    else:
+                        dup = duplicate_object_full(obj, BAKE_SUFFIX, bake_coll)
 
+                    assign_bake_material(dup, curvature_mat)
+                    dup.hide_set(False)
+                    dup.hide_viewport = False
+                    clean_bake_object_modifiers(dup, depsgraph)
+                    dup_map[obj] = dup
 
+                bake_objs = tuple(dup_map.values())
+                log(f"Mesh setup: {time.perf_counter() - phase_start:.2f}s")
 
                 # --------------------------------------------------------
-                # AO Bake
+                # Join For Bake (optional)
                 # --------------------------------------------------------
-                bake.use_pass_direct = True
-                bake.use_pass_indirect = True
-                bake.use_pass_color = True
-
-                render_state = disable_render_temporarily(originals)
-                try:
-                    bake_to_color(context, 'AO', bake_objs, VC_AO)
-                finally:
-                    restore_render_state(render_state)
 
-                # --------------------------------------------------------
-                # Create Combined Bounding Box
-                # --------------------------------------------------------
+                bake_targets = bake_objs
+                if self.batch_mode and len(bake_objs) > 1:
+                    joined = join_bake_objects(context, bake_objs, bake_coll)
+                    bake_targets = [joined]
+                    # The joined copy overlaps the bake objects – keep them out of the AO
+                    dup_render_state = disable_render_temporarily(bake_objs)
 
-                create_combined_bounding_box(
-                    context,
-                    bake_objs,
-                    bake_coll
+                # Curvature and gradient are noise-free – only AO needs the full sample count
+                props = context.scene.vertex_baker
+                samples = min(props.ao_samples, 16) if raycast_ao else props.ao_samples
+                configure_cycles_for_baking(
+                    context.scene,
+                    samples,
+                    gpu_tile_size(context)
                 )
 
-                
-                
                 # --------------------------------------------------------
-                # Gradient Bake
+                # Curvature + AO Bake
                 # --------------------------------------------------------
 
-                for obj in bake_objs:
-                    obj.data.materials.clear()
-                    obj.data.materials.append(gradient_mat)
+                # Bake attributes are created right before the pass that fills them
+                for obj in bake_targets:
+                    ensure_color_attribute(obj, VC_CURVATURE, INTERMEDIATE_COLOR_TYPE)
 
-                bake.use_pass_direct = False
-                bake.use_pass_indirect = False
-                bake.use_pass_color = True
-                bake_to_color(context, 'DIFFUSE', bake_objs, VC_GRADIENT)
+                render_state = disable_render_temporarily(originals)
+                try:
+                    bake_to_color(context, 'DIFFUSE', bake_targets, VC_CURVATURE)
+                finally:
+                    restore_render_state(render_state)
+                wm.progress_update(1)
+
+                if raycast_ao:
+                    phase_start = time.perf_counter()
+                    bake_ambient_occlusion(context, bake_targets, originals, props.ao_samples)
+                    log(f"AO raycast: {time.perf_counter() - phase_start:.2f}s")
+                elif combined_ao:
+                    for obj in bake_targets:
+                        split_curvature_ao(obj)
+                else:
+                    # Edited Mat_Curvature – AO gets its own Cycles bake
+                    for obj in bake_targets:
+                        ensure_color_attribute(obj, VC_AO, INTERMEDIATE_COLOR_TYPE)
+
+                    render_state = disable_render_temporarily(originals)
+                    try:
+                        bake_to_color(context, 'AO', bake_targets, VC_AO)
+                    finally:
+                        restore_render_state(render_state)
+
+                if needs_gradient:
+                    # --------------------------------------------------------
+                    # Create Combined Bounding Box
+                    # --------------------------------------------------------
+
+                    create_combined_bounding_box(
+                        context,
+                        bake_objs,
+                        bake_coll
+                    )
+
+                    # --------------------------------------------------------
+                    # Gradient Bake
+                    # --------------------------------------------------------
+
+                    for obj in bake_targets:
+                        assign_bake_material(obj, gradient_mat)
+                        ensure_color_attribute(obj, VC_GRADIENT, INTERMEDIATE_COLOR_TYPE)
+
+                    bake_to_color(context, 'DIFFUSE', bake_targets, VC_GRADIENT)
+                wm.progress_update(2)
+
+                if joined:
+                    split_joined_bake(
+                        joined,
+                        bake_objs,
+                        baked
+                    )
 
 
                 # --------------------------------------------------------
                 # Packing
                 # --------------------------------------------------------
-                packer = bpy.data.node_groups["VC_Packer"]
-                for obj in bake_objs:
-                    mod = obj.modifiers.new("VC_Packer", 'NODES')
-                    mod.node_group = packer
-                    select_objects(context, [obj], obj)
-                    bpy.ops.object.modifier_apply(modifier=mod.name)
-                    set_active_color_attribute(obj, VC_AO)
+                for orig, obj in dup_map.items():
+                    if channels:
+                        # Linked duplicates pack straight into the original's Mesh
+                        shared = obj.data == orig.data
+                        pack_colors(obj, channels, 'BYTE_COLOR' if shared else 'FLOAT_COLOR')
+                    else:
+                        shared = False
+                        mod = obj.modifiers.new("VC_Packer", 'NODES')
+                        mod.node_group = packer
+                        select_objects(context, [obj], obj)
+                        bpy.ops.object.modifier_apply(modifier=mod.name)
+
+                    # Intermediate channels are packed – free them
+                    remove_unused_target_color_attributes(obj)
+
+                    # Linked duplicates are removed once the bake is over
+                    if not shared:
+                        active_colors.append((obj, VC_PACKED))
 
                 for orig, dup in dup_map.items():
-                    ensure_datatransfer(orig, dup)
+                    if not copy_packed_colors(orig, dup):
+                        # Data Transfer only writes into layers of a matching type
+                        ensure_color_attribute(orig, VC_PACKED)
+                        ensure_datatransfer(orig, dup)
                     remove_unused_target_color_attributes(orig)
                     if "VC_Processor" not in orig.modifiers:
                         mod = orig.modifiers.new("VC_Processor", 'NODES')
-                        mod.node_group = bpy.data.node_groups["VC_Processor"]
+                        mod.node_group = processor
                         mod.show_in_editmode = False
 
                 for orig in originals:
-                    set_active_color_attribute(orig, VC_PREVIEW)
+                    active_colors.append((orig, VC_PREVIEW))
 
                 setup_viewport_for_vertex_colors(context)
 
             finally:
-                bake_coll.hide_viewport = True
+                wm.progress_end()
+                # A failed pass must not leave the joined copy or hidden bake objects behind
+                if joined:
+                    remove_joined_bake(joined)
+                restore_render_state(dup_render_state)
+                remove_linked_duplicates(dup_map)
+                # Excluding drops the bake meshes from the depsgraph, hiding only stops drawing them
+                layer_coll = find_layer_collection(context.view_layer.layer_collection, bake_coll)
+                if layer_coll:
+                    layer_coll.exclude = True
                 context.scene.render.engine = original_engine
+                restore_tile_settings(context.scene, original_tiles)
+
+            # One pass of display-layer changes once everything else settled
+            for obj, name in active_colors:
+                set_active_color_attribute(obj, name)
         
         
 
@@ -645,6 +1666,11 @@ class OBJECT_OT_vc_bake_project(bpy.types.Operator):
         else:
             log(f"Bake finished at: {timestamp_now()}")
 
+        finally:
+            restore_global_undo(context, undo_state)
+            # Shared across the objects of one bake – large meshes shouldn't pin them afterwards
+            _SCRATCH.clear()
+
         restore_selection(context, selection_state)
 
         end_time = datetime.datetime.now()
@@ -729,6 +1755,9 @@ def register():
 
 
 def unregister():
+    _SCRATCH.clear()
+    if bpy.app.timers.is_registered(_flush_vc_processor_update):
+        bpy.app.timers.unregister(_flush_vc_processor_update)
 
     del bpy.types.Scene.vertex_baker
 